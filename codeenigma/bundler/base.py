@@ -1,7 +1,125 @@
+import os
+import shutil
+import threading
+import tomllib
+import uuid
 from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import Optional
 
+import rich
+
+_TOML_CACHE: dict[tuple[str, int], dict] = {}
+
+
+def load_pyproject(path: Path) -> dict:
+    """
+    Loads and caches the parsed pyproject.toml, keyed by path and mtime.
+    """
+    key = (str(path.resolve()), path.stat().st_mtime_ns)
+    if key not in _TOML_CACHE:
+        with open(path, "rb") as f:
+            _TOML_CACHE[key] = tomllib.load(f)
+    return _TOML_CACHE[key]
+
+
+def invalidate_pyproject(path: Path) -> None:
+    """
+    Drops every cached entry of the given pyproject.toml.
+    """
+    resolved = str(path.resolve())
+    for key in [k for k in _TOML_CACHE if k[0] == resolved]:
+        _TOML_CACHE.pop(key, None)
+
+
+def build_ext_inprocess(location: Path) -> bool:
+    """
+    Runs `setup.py build_ext --inplace` inside the current interpreter.
+
+    Returns False when setuptools or Cython can't be imported, so the caller can
+    fall back to building in a subprocess.
+
+    Raises:
+        RuntimeError: If the extension failed to build
+    """
+    try:
+        import Cython  # noqa: F401
+        import setuptools  # noqa: F401
+    except ImportError:
+        return False
+
+    # distutils is provided by setuptools on Python 3.12+
+    from distutils.core import run_setup
+
+    cwd = os.getcwd()
+    os.chdir(location)
+    try:
+        dist = run_setup("setup.py", ["build_ext", "--inplace"])
+    finally:
+        os.chdir(cwd)
+
+    # run_setup swallows the SystemExit setup() reports build errors with, so
+    # check that build_ext actually completed
+    if not dist.have_run.get("build_ext"):
+        raise RuntimeError(
+            f"build_ext failed in {location}, see the compiler output above"
+        )
+    return True
+
+
+TRASH_PREFIX = ".codeenigma-trash-"
+
+# trash directories still being deleted by this process
+_PENDING_TRASH: set[Path] = set()
+
+
+def _remove_trash(trash: Path, stale: list[Path]) -> None:
+    # left behind by an interrupted run, nothing to report if it's gone already
+    for path in stale:
+        shutil.rmtree(path, ignore_errors=True)
+
+    try:
+        shutil.rmtree(trash)
+    except OSError as e:
+        rich.print(
+            f"[yellow]Could not remove temporary build files {trash}: {e}[/yellow]"
+        )
+    finally:
+        _PENDING_TRASH.discard(trash)
+
+
+def discard_tree(path: Path) -> threading.Thread | None:
+    """
+    Renames the directory aside and deletes it in a background thread.
+
+    The trash stays next to the directory, so the rename never crosses filesystems.
+    Trash left behind by an interrupted run is deleted along with it. The thread
+    isn't a daemon, so the interpreter still finishes the deletion on exit.
+
+    Returns:
+        The thread deleting the directory, or None if it was deleted in the foreground
+    """
+    if not path.is_dir():
+        return None
+
+    stale = [
+        trash
+        for trash in path.parent.glob(f"{TRASH_PREFIX}*")
+        if trash not in _PENDING_TRASH
+    ]
+    trash = path.with_name(f"{TRASH_PREFIX}{uuid.uuid4().hex}")
+    try:
+        os.rename(path, trash)
+    except OSError:
+        # e.g. files still in use on Windows, delete in the foreground
+        shutil.rmtree(path)
+        return None
+
+    _PENDING_TRASH.add(trash)
+    thread = threading.Thread(target=_remove_trash, args=(trash, stale))
+    thread.start()
+    return thread
+
 
 class IBundler(ABC):  # pragma: no cover
     """
@@ -19,3 +137,19 @@ class IBundler(ABC):  # pragma: no cover
         self, module_path: Path, output_dir: Optional[Path] = None, **kwargs
     ) -> Path:
         pass
+
+    @staticmethod
+    def _place(src: Path, output_dir: Path | None = None) -> Path:
+        """
+        Moves the built artifact into output_dir, renaming it when on the same filesystem.
+        """
+        if output_dir is None:
+            return src
+
+        output_dir.mkdir(exist_ok=True)
+        dst = output_dir / src.name
+        try:
+            os.replace(src, dst)
+        except OSError:
+            shutil.move(src, dst)
+        return dst
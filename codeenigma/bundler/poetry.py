@@ -1,65 +1,128 @@
-import shutil
+import mmap
+import os
 import subprocess
+import sys
+from importlib.util import find_spec
 from os import environ
 from pathlib import Path
 
 import rich
 
-from codeenigma.bundler.base import IBundler
+from codeenigma.bundler.base import (
+    IBundler,
+    build_ext_inprocess,
+    discard_tree,
+    invalidate_pyproject,
+    load_pyproject,
+)
 from codeenigma.constants import EXTENSION_COMPILED_MODULE
+from codeenigma.utils import new_match, snapshot_matches
+
+README_ENTRY = b'readme = "README.md"'
 
 
 class PoetryBundler(IBundler):
     @staticmethod
     def remove_readme_before_build(pyproject_path: Path):
-        with open(pyproject_path) as f:
-            content = f.read()
+        with open(pyproject_path, "r+b") as f:
+            size = os.fstat(f.fileno()).st_size
+            if not size:
+                return
+
+            # shift the tail over each readme entry in place, then truncate
+            with mmap.mmap(f.fileno(), 0) as mm:
+                idx = mm.find(README_ENTRY)
+                while idx != -1:
+                    tail = idx + len(README_ENTRY)
+                    mm.move(idx, tail, size - tail)
+                    size -= len(README_ENTRY)
+                    idx = mm.find(README_ENTRY, idx, size)
+
+            f.truncate(size)
 
-        with open(pyproject_path, "w") as f:
-            f.write(content.replace('readme = "README.md"', ""))
+        invalidate_pyproject(pyproject_path)
+
+    @staticmethod
+    def _has_build_backend() -> bool:
+        """Checks whether `build` and the poetry-core backend are importable"""
+        try:
+            return bool(find_spec("build.__main__") and find_spec("poetry.core"))
+        except ModuleNotFoundError:
+            return False
+
+    @staticmethod
+    def _runs_in_project_env(location: Path) -> bool:
+        """
+        Checks whether this interpreter belongs to the Poetry env of the project, as
+        building in-process targets this interpreter instead of the project's one.
+        """
+        try:
+            result = subprocess.run(
+                ["poetry", "env", "info", "-p"],
+                cwd=str(location),
+                check=True,
+                capture_output=True,
+                text=True,
+            )
+        except (OSError, subprocess.CalledProcessError):
+            return False
+
+        return Path(result.stdout.strip()).absolute() == Path(sys.prefix).absolute()
+
+    def _build_wheel(self, project_root: Path) -> None:
+        """
+        Builds through the poetry-core backend directly when possible, skipping the
+        full poetry CLI startup, and falls back to `poetry build` if that fails.
+        """
+        if self._has_build_backend():
+            rich.print(
+                "[bold blue]Building wheel using build (poetry-core)[/bold blue]"
+            )
+            try:
+                subprocess.run(
+                    [sys.executable, "-m", "build", "--wheel", "--no-isolation"],
+                    cwd=str(project_root),
+                    check=True,
+                )
+                return
+            except subprocess.CalledProcessError:
+                rich.print("[yellow]build failed, retrying with poetry[/yellow]")
+
+        rich.print("[bold blue]Building wheel using poetry[/bold blue]")
+        subprocess.run(
+            ["poetry", "build", "-f", "wheel"],
+            cwd=str(project_root),
+            check=True,
+        )
 
     def create_wheel(self, module_path: Path, output_dir: Path | None = None, **kwargs):
+        # the wheel isn't needed while building an executable
+        if environ.get("CODEENIGMA_BUILDING_EXE") == "1":
+            return None
+
         # check if the pyproject.toml is in poetry format
         if not (module_path.parent / "pyproject.toml").exists():
             raise FileNotFoundError(f"pyproject.toml not found in {module_path.parent}")
 
         # check if the pyproject.toml is in poetry format
-        with open(module_path.parent / "pyproject.toml", "rb") as f:
-            import tomllib
-
-            content = tomllib.load(f)
-            try:
-                version = content["tool"]["poetry"]["version"]
-            except KeyError as e:
-                raise Exception(
-                    "Invalid pyproject.toml file, not in poetry format"
-                ) from e
+        content = load_pyproject(module_path.parent / "pyproject.toml")
+        try:
+            version = content["tool"]["poetry"]["version"]
+        except KeyError as e:
+            raise Exception("Invalid pyproject.toml file, not in poetry format") from e
 
         if kwargs.get("remove_readme", True):
             self.remove_readme_before_build(module_path.parent / "pyproject.toml")
 
-        if environ.get("CODEENIGMA_BUILDING_EXE", "0") == "0":
-            rich.print("[bold blue]Building wheel using poetry[/bold blue]")
-            subprocess.run(
-                ["poetry", "build", "-f", "wheel"],
-                cwd=str(module_path.parent),
-                check=True,
-            )
+        self._build_wheel(module_path.parent)
 
-            wheel_file = list((module_path.parent / "dist").glob(f"*{version}*.whl"))[
-                -1
-            ]
-            final_wheel_location = wheel_file
+        wheel_file = list((module_path.parent / "dist").glob(f"*{version}*.whl"))[-1]
+        final_wheel_location = self._place(wheel_file, output_dir)
 
-            if output_dir:
-                output_dir.mkdir(exist_ok=True)
-                final_wheel_location = output_dir / wheel_file.name
-                shutil.move(wheel_file, final_wheel_location)
-
-            rich.print(
-                f"[green]✓ Wheel built successfully ({final_wheel_location})[/green]"
-            )
-            return final_wheel_location
+        rich.print(
+            f"[green]✓ Wheel built successfully ({final_wheel_location})[/green]"
+        )
+        return final_wheel_location
 
     def create_extension(
         self, module_path: Path, output_dir: Path | None = None, **kwargs
@@ -74,31 +137,34 @@ class PoetryBundler(IBundler):
                 f"setup.py not found in {module_path.parent} or {module_path}"
             )
 
-        rich.print("[bold blue]Building extension using poetry[/bold blue]")
-        try:
-            subprocess.run(
-                ["poetry", "run", "python", "setup.py", "build_ext", "--inplace"],
-                cwd=str(location),
-                check=True,
-            )
-        except subprocess.CalledProcessError:
-            import sys
+        compiled_pattern = f"*{EXTENSION_COMPILED_MODULE}"
+        existing = snapshot_matches(location, compiled_pattern)
 
-            subprocess.run(
-                [sys.executable, "setup.py", "build_ext", "--inplace"],
-                cwd=str(location),
-                check=True,
-            )
+        built = False
+        if self._runs_in_project_env(location):
+            rich.print("[bold blue]Building extension in-process[/bold blue]")
+            built = build_ext_inprocess(location)
 
-        module_file = list(location.glob(f"*{EXTENSION_COMPILED_MODULE}"))[-1]
+        if not built:
+            rich.print("[bold blue]Building extension using poetry[/bold blue]")
+            try:
+                subprocess.run(
+                    ["poetry", "run", "python", "setup.py", "build_ext", "--inplace"],
+                    cwd=str(location),
+                    check=True,
+                )
+            except subprocess.CalledProcessError:
+                subprocess.run(
+                    [sys.executable, "setup.py", "build_ext", "--inplace"],
+                    cwd=str(location),
+                    check=True,
+                )
+
+        module_file = new_match(location, compiled_pattern, existing)
         # clean up intermediate files
-        shutil.rmtree(location / "build")
+        discard_tree(location / "build")
 
-        final_module_location = module_file
-        if output_dir:
-            output_dir.mkdir(exist_ok=True)
-            shutil.move(module_file, output_dir / module_file.name)
-            final_module_location = output_dir / module_file.name
+        final_module_location = self._place(module_file, output_dir)
 
         rich.print(
             f"[green]✓ Extension built successfully ({final_module_location})[/green]"
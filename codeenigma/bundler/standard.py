@@ -1,12 +1,19 @@
-import shutil
 import subprocess
 import sys
+import tempfile
+from importlib.util import find_spec
 from pathlib import Path
 
 import rich
 
-from codeenigma.bundler.base import IBundler
+from codeenigma.bundler.base import (
+    IBundler,
+    build_ext_inprocess,
+    discard_tree,
+    load_pyproject,
+)
 from codeenigma.constants import EXTENSION_COMPILED_MODULE
+from codeenigma.utils import new_match, snapshot_matches
 
 
 class StandardBundler(IBundler):  # pragma: no cover
@@ -23,14 +30,9 @@ class StandardBundler(IBundler):  # pragma: no cover
 
         elif (project_root / "pyproject.toml").exists():
             try:
-                with open(project_root / "pyproject.toml", "rb") as f:
-                    import tomllib
-
-                    content = tomllib.load(f)
-                    build_backend = content.get("build-system", {}).get(
-                        "build-backend", ""
-                    )
-                    status = "setuptools" in build_backend
+                content = load_pyproject(project_root / "pyproject.toml")
+                build_backend = content.get("build-system", {}).get("build-backend", "")
+                status = "setuptools" in build_backend
             except KeyError:
                 status = False
 
@@ -40,38 +42,61 @@ class StandardBundler(IBundler):  # pragma: no cover
                 "Cannot build extensions without setuptools."
             )
 
+    @staticmethod
+    def _has_build() -> bool:
+        """
+        Checks that the `build` package is importable, looking for its __main__ so a
+        build/ directory on sys.path isn't mistaken for it.
+        """
+        try:
+            return find_spec("build.__main__") is not None
+        except ModuleNotFoundError:
+            return False
+
+    @staticmethod
+    def _run_quiet(cmd: list[str], cwd: Path | None = None) -> None:
+        """
+        Runs the command with its output spooled to a temporary file instead of a pipe.
+
+        Raises:
+            subprocess.CalledProcessError: If the command fails, carrying its captured
+                output so the caller can decide whether to print it
+        """
+        with tempfile.TemporaryFile() as output:
+            try:
+                subprocess.run(
+                    cmd,
+                    cwd=str(cwd) if cwd else None,
+                    check=True,
+                    stdout=output,
+                    stderr=subprocess.STDOUT,
+                )
+            except subprocess.CalledProcessError as e:
+                output.seek(0)
+                e.output = output.read()
+                raise
+
     def create_wheel(self, module_path: Path, output_dir: Path | None = None, **kwargs):
         self._check_for_setuptools_project(module_path.parent)
         rich.print("[bold blue]Building wheel using standard setuptools[/bold blue]")
         try:
             # First try with uv if available
-            subprocess.run(
-                ["uv", "pip", "wheel", "--no-deps", "-e", "."],
-                cwd=str(module_path.parent),
-                check=True,
-                capture_output=True,
-            )
+            self._run_quiet(["uv", "build", "--wheel"], module_path.parent)
         except (subprocess.CalledProcessError, FileNotFoundError):
-            # Fall back to pip if uv is not available
-            subprocess.run(
-                ["pip", "install", "build"],
-                check=True,
-                capture_output=True,
-            )
-            subprocess.run(
-                [sys.executable, "-m", "build", "--wheel"],
-                cwd=str(module_path.parent),
-                check=True,
-                capture_output=True,
-            )
+            # Fall back to build, installing it with pip only when missing. The uv
+            # output is dropped since the fallback may still succeed
+            try:
+                if not self._has_build():
+                    self._run_quiet([sys.executable, "-m", "pip", "install", "build"])
+                self._run_quiet(
+                    [sys.executable, "-m", "build", "--wheel"], module_path.parent
+                )
+            except subprocess.CalledProcessError as e:
+                sys.stderr.write(e.output.decode(errors="replace"))
+                raise
 
         wheel_file = list((module_path.parent / "dist").glob("*.whl"))[-1]
-        final_wheel_location = wheel_file
-
-        if output_dir:
-            output_dir.mkdir(exist_ok=True)
-            final_wheel_location = output_dir / wheel_file.name
-            shutil.move(wheel_file, final_wheel_location)
+        final_wheel_location = self._place(wheel_file, output_dir)
 
         rich.print(
             f"[green]✓ Wheel built successfully ({final_wheel_location})[/green]"
@@ -93,24 +118,22 @@ class StandardBundler(IBundler):  # pragma: no cover
             else module_path.parent
         )
 
-        subprocess.run(
-            [sys.executable, "setup.py", "build_ext", "--inplace"],
-            cwd=str(location),
-            check=True,
-        )
+        compiled_pattern = f"*{EXTENSION_COMPILED_MODULE}"
+        existing = snapshot_matches(location, compiled_pattern)
+        if not build_ext_inprocess(location):
+            subprocess.run(
+                [sys.executable, "setup.py", "build_ext", "--inplace"],
+                cwd=str(location),
+                check=True,
+            )
 
-        module_file = list(location.glob(f"*{EXTENSION_COMPILED_MODULE}"))[-1]
+        module_file = new_match(location, compiled_pattern, existing)
         # clean up intermediate files
 
         build_path = location.joinpath("build")
-        shutil.rmtree(build_path)
-
-        final_module_location = module_file
-        module_file_path = location.joinpath(module_file.name)
-        if output_dir:
-            output_dir.mkdir(exist_ok=True)
-            shutil.move(module_file, module_file_path)
-            final_module_location = module_file_path
+        discard_tree(build_path)
+
+        final_module_location = self._place(module_file, output_dir)
 
         rich.print(
             f"[green]✓ Extension built successfully ({final_module_location})[/green]"
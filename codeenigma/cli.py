@@ -2,6 +2,8 @@
 CLI interface for CodeEnigma
 """
 
+import os
+import re
 import shutil
 import subprocess
 import traceback
@@ -18,10 +20,12 @@ from codeenigma import __version__
 from codeenigma.bundler.poetry import PoetryBundler
 from codeenigma.constants import EXTENSION_COMPILED_MODULE
 from codeenigma.extensions import ExpiryExtension
+from codeenigma.io import rewrite_files
 from codeenigma.orchestrator import Orchestrator
 from codeenigma.private import NONCE, SECRET_KEY
 from codeenigma.runtime.cython.builder import CythonRuntimeBuilder
 from codeenigma.strategies import CodeEnigmaObfuscationStrategy
+from codeenigma.utils import newest_match, walk_match
 
 app = typer.Typer(
     name="codeenigma",
@@ -30,6 +34,8 @@ app = typer.Typer(
 )
 console = Console()
 
+RUNTIME_IMPORT_PATTERN = re.compile(rb"from codeenigma_runtime")
+
 
 def display_banner():
     """Display a nice CLI banner."""
@@ -179,21 +185,20 @@ def build(
         runtime_path = dist_path.joinpath("codeenigma_runtime")
         dest = path_module_obfuscated.joinpath("codeenigma_runtime")
 
-        old_text = "from codeenigma_runtime"
-        new_text = f"from {module_name}.codeenigma_runtime"
-        for file in path_module_obfuscated.rglob("*.py"):
-            file_text = file.read_text()
-            text_replaced = file_text.replace(old_text, new_text)
-            file.write_text(text_replaced)
-
-        shutil.move(runtime_path, dest)
-
         path_spec_template = templates_path.joinpath("pyinstaller.spec.template")
+        dest_spec_file = dist_path.joinpath(f"{module_name}.spec")
+        entry_point = module_path.resolve().joinpath("__main__.py")
 
-        pattern_search = f"*{EXTENSION_COMPILED_MODULE}"
-        glob_file = dest.rglob(pattern_search)
+        replacement = f"from {module_name}.codeenigma_runtime".encode()
+        rewrite_files(
+            walk_match(os.fspath(path_module_obfuscated), "*.py"),
+            RUNTIME_IMPORT_PATTERN,
+            replacement,
+        )
+
+        shutil.move(runtime_path, dest)
 
-        runtime_compiled = list(glob_file)[-1]
+        runtime_compiled = newest_match(dest, f"*{EXTENSION_COMPILED_MODULE}")
         t = Template(path_spec_template.read_text(encoding="utf-8"))
 
         # compiled_codeenigma should be a list of 2-tuples: (source, destination)
@@ -203,15 +208,12 @@ def build(
 
         module_spec = t.safe_substitute(
             {
-                "entry_point": repr(
-                    str(Path(module_path).resolve().joinpath("__main__.py"))
-                ),
+                "entry_point": repr(str(entry_point)),
                 "compiled_codeenigma": compiled_codeenigma,
                 "exe_name": exe_name,
             }
         )
 
-        dest_spec_file = dist_path.joinpath(f"{module_name}.spec")
         with dest_spec_file.open("w", encoding="utf-8") as f:
             f.write(module_spec)
 
@@ -0,0 +1,148 @@
+"""
+Bulk rewrite of files, submitted through io_uring when it is available.
+
+io_uring support needs the optional `liburing` package (2026.3.25 or newer) and a
+Linux kernel with io_uring enabled.
+"""
+
+import os
+import re
+import sys
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import liburing
+except ImportError:  # pragma: no cover
+    liburing = None
+else:
+    # releases before 2026.3.25 expose another API, without Ring and Cqe
+    if not hasattr(liburing, "Ring"):  # pragma: no cover
+        liburing = None
+
+_RING_ENTRIES = 256
+
+StrPath = str | os.PathLike
+
+
+def _rewrite_file(path: StrPath, pattern: re.Pattern, replacement: bytes) -> None:
+    with open(path, "rb") as f:
+        data = f.read()
+
+    new_data, count = pattern.subn(replacement, data)
+    if count:
+        with open(path, "wb") as f:
+            f.write(new_data)
+
+
+def _wait_completions(ring, cqe, count: int) -> dict[int, int]:
+    """Waits for count completions and returns their results by user data"""
+    results = {}
+    for _ in range(count):
+        liburing.io_uring_wait_cqe(ring, cqe)
+        entry = cqe[0]
+        results[entry.user_data] = entry.res
+        liburing.io_uring_cqe_seen(ring, entry)
+
+    for idx, res in results.items():
+        if res < 0:
+            raise OSError(-res, os.strerror(-res), idx)
+    return results
+
+
+def _uring_rewrite_batch(
+    ring, cqe, paths: list[StrPath], pattern: re.Pattern, replacement: bytes
+) -> None:
+    fds: list[int] = []
+    try:
+        # Step 1: queue a read of every file of the batch
+        buffers = []
+        for idx, path in enumerate(paths):
+            fd = os.open(path, os.O_RDWR)
+            fds.append(fd)
+            buffer = bytearray(os.fstat(fd).st_size)
+            buffers.append(buffer)
+
+            sqe = liburing.io_uring_get_sqe(ring)
+            liburing.io_uring_prep_read(sqe, fd, buffer, 0)
+            liburing.io_uring_sqe_set_data64(sqe, idx)
+
+        liburing.io_uring_submit(ring)
+        reads = _wait_completions(ring, cqe, len(paths))
+
+        # Step 2: queue a write of every file that changed
+        writes = {}
+        for idx, buffer in enumerate(buffers):
+            if reads[idx] != len(buffer):
+                raise OSError(f"Short read of {paths[idx]}")
+
+            new_data, count = pattern.subn(replacement, buffer)
+            if not count:
+                continue
+
+            writes[idx] = new_data
+            sqe = liburing.io_uring_get_sqe(ring)
+            liburing.io_uring_prep_write(sqe, fds[idx], new_data, 0)
+            liburing.io_uring_sqe_set_data64(sqe, idx)
+
+        if not writes:
+            return
+
+        liburing.io_uring_submit(ring)
+        written = _wait_completions(ring, cqe, len(writes))
+
+        for idx, new_data in writes.items():
+            if written[idx] != len(new_data):
+                raise OSError(f"Short write of {paths[idx]}")
+            if len(new_data) < len(buffers[idx]):
+                os.ftruncate(fds[idx], len(new_data))
+    finally:
+        for fd in fds:
+            os.close(fd)
+
+
+def _uring_rewrite(
+    ring, paths: list[StrPath], pattern: re.Pattern, replacement: bytes
+) -> None:
+    """Rewrites the files submitting their reads and writes in batches to the ring"""
+    cqe = liburing.Cqe()
+    for start in range(0, len(paths), _RING_ENTRIES):
+        batch = paths[start : start + _RING_ENTRIES]
+        _uring_rewrite_batch(ring, cqe, batch, pattern, replacement)
+
+
+def rewrite_files(
+    paths: Iterable[StrPath], pattern: re.Pattern, replacement: bytes
+) -> None:
+    """
+    Replaces every match of pattern in the given files, leaving untouched files unwritten.
+
+    Uses io_uring on Linux when liburing is installed, falling back to a thread pool
+    of blocking reads and writes otherwise.
+
+    Args:
+        paths: Files to rewrite
+        pattern: Compiled bytes pattern to search for
+        replacement: Bytes replacing each match
+    """
+    paths = list(paths)
+
+    if liburing is not None and sys.platform == "linux":
+        ring = liburing.Ring()
+        try:
+            liburing.io_uring_queue_init(_RING_ENTRIES, ring)
+        except OSError:
+            # io_uring can be disabled by the kernel or a sandbox
+            ring = None
+
+        if ring is not None:
+            try:
+                _uring_rewrite(ring, paths, pattern, replacement)
+            finally:
+                liburing.io_uring_queue_exit(ring)
+            return
+
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        list(
+            executor.map(lambda path: _rewrite_file(path, pattern, replacement), paths)
+        )
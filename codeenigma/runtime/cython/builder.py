@@ -1,7 +1,13 @@
+import base64
+import hashlib
 import platform
 import shutil
+import tomllib
+import zipfile
 from collections.abc import Sequence
-from contextlib import suppress
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from os import environ
 from pathlib import Path
 from string import Template
 
@@ -14,6 +20,90 @@ from codeenigma.runtime.base import IRuntimeBuilder
 from codeenigma.strategies import BaseObfuscationStrategy
 
 
+@cache
+def _load_template(name: str) -> Template:
+    """Reads and wraps a template of this runtime once per process"""
+    template_path = Path(__file__).parent.joinpath(name)
+    with template_path.open(encoding="utf-8") as f:
+        return Template(f.read())
+
+
+def _record_entry(arcname: str, data: bytes) -> str:
+    digest = base64.urlsafe_b64encode(hashlib.sha256(data).digest()).rstrip(b"=")
+    return f"{arcname},sha256={digest.decode()},{len(data)}"
+
+
+def _build_runtime_wheel_inprocess(
+    codeenigma_runtime_dir: Path, output_dir: Path
+) -> Path:
+    """
+    Zips the runtime package into a wheel without going through a build backend.
+
+    The metadata is taken from the pyproject.toml template of the runtime, so the
+    wheel matches what poetry-core would have produced from it.
+    """
+    # poetry-core is only needed here, keep it off the CLI startup
+    from poetry.core.constraints.version import parse_constraint
+    from poetry.core.factory import Factory
+    from poetry.core.version.helpers import format_python_constraint
+
+    pyproject = tomllib.loads(
+        _load_template("pyproject.toml.template").safe_substitute(
+            {"version": repr(__version__), "module_file_path": ""}
+        )
+    )["tool"]["poetry"]
+    dependencies = dict(pyproject.get("dependencies", {}))
+    requires_python = dependencies.pop("python", None)
+
+    name, version = pyproject["name"], pyproject["version"]
+    dist_info = f"{name}-{version}.dist-info"
+
+    metadata = [
+        "Metadata-Version: 2.1",
+        f"Name: {name}",
+        f"Version: {version}",
+        f"Summary: {pyproject['description']}",
+    ]
+    if requires_python:
+        python_constraint = format_python_constraint(parse_constraint(requires_python))
+        metadata.append(f"Requires-Python: {python_constraint}")
+    # Poetry specs (carets, tildes, tables with markers) are not PEP 508 as-is
+    metadata += [
+        f"Requires-Dist: {Factory.create_dependency(dep, spec).to_pep_508()}"
+        for dep, spec in dependencies.items()
+    ]
+
+    wheel = [
+        "Wheel-Version: 1.0",
+        f"Generator: codeenigma ({__version__})",
+        "Root-Is-Purelib: true",
+        "Tag: py3-none-any",
+    ]
+
+    output_dir.mkdir(exist_ok=True)
+    wheel_path = output_dir / f"{name}-{version}-py3-none-any.whl"
+    record = []
+    with zipfile.ZipFile(wheel_path, "w", zipfile.ZIP_DEFLATED) as whl:
+        files = [
+            (f"{codeenigma_runtime_dir.name}/{path.name}", path.read_bytes())
+            for path in sorted(codeenigma_runtime_dir.iterdir())
+            if path.is_file()
+        ]
+        files += [
+            (f"{dist_info}/METADATA", ("\n".join(metadata) + "\n").encode()),
+            (f"{dist_info}/WHEEL", ("\n".join(wheel) + "\n").encode()),
+        ]
+
+        for arcname, data in files:
+            whl.writestr(arcname, data)
+            record.append(_record_entry(arcname, data))
+
+        record.append(f"{dist_info}/RECORD,,")
+        whl.writestr(f"{dist_info}/RECORD", "\n".join(record) + "\n")
+
+    return wheel_path
+
+
 class CythonRuntimeBuilder(IRuntimeBuilder):
     def __init__(
         self,
@@ -30,11 +120,9 @@ class CythonRuntimeBuilder(IRuntimeBuilder):
             "[bold blue]Creating setup.py file for compiling the codeenigma.pyx file [/bold blue]"
         )
 
-        path_setup_template = Path(__file__).parent.joinpath("setup.py.template")
-        with path_setup_template.open(encoding="utf-8") as f:
-            template = Template(f.read())
-
-        setup_code = template.safe_substitute({"version": repr(__version__)})
+        setup_code = _load_template("setup.py.template").safe_substitute(
+            {"version": repr(__version__)}
+        )
         output_setup_file = output_path.joinpath("setup.py")
         with output_setup_file.open("w", encoding="utf-8") as f:
             f.write(setup_code)
@@ -46,11 +134,9 @@ class CythonRuntimeBuilder(IRuntimeBuilder):
             "[bold blue]Creating codeenigma_runtime/__init__.py file[/bold blue]"
         )
 
-        init_template_path = Path(__file__).parent.joinpath("init.py.template")
-        with init_template_path.open(encoding="utf-8") as f:
-            template = Template(f.read())
-
-        init_code = template.safe_substitute({"platform": repr(platform.system())})
+        init_code = _load_template("init.py.template").safe_substitute(
+            {"platform": repr(platform.system())}
+        )
         output_init_file = output_path.joinpath("__init__.py")
         with output_init_file.open("w", encoding="utf-8") as f:
             f.write(init_code)
@@ -60,33 +146,12 @@ class CythonRuntimeBuilder(IRuntimeBuilder):
             stub_template_path, output_path.joinpath("codeenigma_runtime.pyi")
         )
 
-    @staticmethod
-    def create_pyproject_toml(module_file_path: str, output_path: Path) -> None:
-        """Creates the pyproject.toml file"""
-        rich.print(
-            "[bold blue]Creating pyproject.toml file for codeenigma_runtime pkg[/bold blue]"
-        )
-
-        template_path = Path(__file__).parent.joinpath("pyproject.toml.template")
-        with template_path.open(encoding="utf-8") as f:
-            template = Template(f.read())
-
-        pyproject_content = template.safe_substitute(
-            {"version": repr(__version__), "module_file_path": str(module_file_path)}
-        )
-
-        output_project_file = output_path.joinpath("pyproject.toml")
-        with output_project_file.open("w", encoding="utf-8") as f:
-            f.write(pyproject_content)
-
     def prepare_runtime_code(self, runtime_pyx_path: Path) -> None:
         with runtime_pyx_path.open("w", encoding="utf-8") as f:
-            code = self.strategy.get_runtime_code()
+            f.write(self.strategy.get_runtime_code())
 
             for extension in self.extensions:
-                code += extension.get_code()
-
-            f.write(code)
+                f.write(extension.get_code())
 
     def build(self, output_dir: Path) -> None:
         """Builds the runtime package"""
@@ -94,43 +159,50 @@ class CythonRuntimeBuilder(IRuntimeBuilder):
         rich.print("[bold blue]Building the runtime package[/bold blue]")
 
         # Building the .so extension
-        # Step 1: Creates the codeenigma.pyx and setup files
+        # Step 1: Creates the codeenigma.pyx and setup files, while the
+        # __init__.py of the runtime package is rendered in the background.
+        # The bundler may chdir to build in-process, so keep paths absolute
+        output_dir = output_dir.resolve()
         output_dir.mkdir(exist_ok=True)
         codeenigma_runtime_pyx = output_dir.joinpath("codeenigma_runtime.pyx")
-        self.prepare_runtime_code(codeenigma_runtime_pyx)
-        self.create_cython_setup(output_dir)
+        codeenigma_runtime_dir = output_dir.joinpath("codeenigma_runtime")
+        codeenigma_runtime_dir.mkdir(exist_ok=True)
 
-        # Step 2: Compiles the codeenigma.pyx file using the bundler to .so
-        module_file = self.bundler.create_extension(output_dir)
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            pyx_future = executor.submit(
+                self.prepare_runtime_code, codeenigma_runtime_pyx
+            )
+            setup_future = executor.submit(self.create_cython_setup, output_dir)
+            init_future = executor.submit(self.create_init_file, codeenigma_runtime_dir)
 
-        # Clean up intermediate files
-        for temp_file in [
-            "setup.py",
-            "codeenigma_runtime.pyx",
-            "codeenigma_runtime.c",
-        ]:
-            output_dir.joinpath(temp_file).unlink(missing_ok=True)
+            pyx_future.result()
+            setup_future.result()
 
-        with suppress(Exception):
-            output_dir.joinpath("build").rmdir()
+            # Step 2: Compiles the codeenigma.pyx file using the bundler to .so,
+            # placed directly inside the runtime package
+            self.bundler.create_extension(output_dir, output_dir=codeenigma_runtime_dir)
 
-        # Packing into codeenigma_runtime wheel
+            # Clean up intermediate files
+            for temp_file in [
+                "setup.py",
+                "codeenigma_runtime.pyx",
+                "codeenigma_runtime.c",
+            ]:
+                output_dir.joinpath(temp_file).unlink(missing_ok=True)
 
-        rich.print("[bold blue]\nPacking the runtime package[/bold blue]")
-        # Step 3: Creates the __init__.py file
+            # Packing into codeenigma_runtime wheel
 
-        codeenigma_runtime_dir = output_dir.joinpath("codeenigma_runtime")
-        codeenigma_runtime_dir.mkdir(exist_ok=True)
-        path_module = codeenigma_runtime_dir.joinpath(module_file.name)
-        shutil.move(module_file, path_module)
+            rich.print("[bold blue]\nPacking the runtime package[/bold blue]")
+            # Step 3: Waits for the __init__.py file
+            init_future.result()
 
-        init_path = output_dir.joinpath("codeenigma_runtime")
-        self.create_init_file(init_path)
+        # Step 4: Zips the runtime package into a wheel. It has a fixed layout, so
+        # the bundler's build backend is kept for the user's own project only
+        if environ.get("CODEENIGMA_BUILDING_EXE") == "1":
+            return
 
-        # Step 4: Creates a pyproject.toml file
-        self.create_pyproject_toml(f"codeenigma_runtime/{module_file.name}", output_dir)
+        wheel_file = _build_runtime_wheel_inprocess(codeenigma_runtime_dir, output_dir)
 
-        # Step 5. Generates wheel using the bundler
-        self.bundler.create_wheel(codeenigma_runtime_dir, output_dir)
-
-        rich.print("[green]✓ Runtime package built successfully[/green]")
+        rich.print(
+            f"[green]✓ Runtime package built successfully ({wheel_file})[/green]"
+        )
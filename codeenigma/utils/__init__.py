@@ -0,0 +1,8 @@
+from codeenigma.utils.fastglob import (
+    new_match,
+    newest_match,
+    snapshot_matches,
+    walk_match,
+)
+
+__all__ = ["new_match", "newest_match", "snapshot_matches", "walk_match"]
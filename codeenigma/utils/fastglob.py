@@ -0,0 +1,102 @@
+"""
+scandir based helpers to match files without going through Path.glob/rglob.
+"""
+
+import fnmatch
+import os
+import re
+from collections.abc import Iterator
+from functools import lru_cache
+from pathlib import Path
+
+
+@lru_cache
+def _compiled(pattern: str) -> re.Pattern:
+    return re.compile(fnmatch.translate(pattern))
+
+
+def walk_match(root: str | os.PathLike, pattern: str) -> Iterator[str]:
+    """
+    Recursively yields the files under root whose name matches the pattern.
+
+    Paths are yielded as plain strings to spare a Path allocation per file.
+
+    Args:
+        root: Directory to walk
+        pattern: Shell-style pattern matched against the file name
+
+    Returns:
+        An iterator over the matching file paths
+    """
+    match = _compiled(pattern).match
+    stack = [os.fspath(root)]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif match(entry.name):
+                    yield entry.path
+
+
+def newest_match(root: Path, pattern: str) -> Path:
+    """
+    Returns the most recently modified file directly under root matching the pattern.
+
+    Args:
+        root: Directory to scan (not recursive)
+        pattern: Shell-style pattern matched against the file name
+
+    Raises:
+        FileNotFoundError: If no file matches
+    """
+    match = _compiled(pattern).match
+    newest, newest_mtime = None, -1
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_file() and match(entry.name):
+                mtime = entry.stat().st_mtime_ns
+                if mtime > newest_mtime:
+                    newest, newest_mtime = entry.path, mtime
+
+    if newest is None:
+        raise FileNotFoundError(f"No file matching {pattern} found in {root}")
+    return Path(newest)
+
+
+def snapshot_matches(root: Path, pattern: str) -> dict[str, int]:
+    """
+    Returns the files directly under root matching the pattern, mapped to their mtime.
+    """
+    match = _compiled(pattern).match
+    with os.scandir(root) as entries:
+        return {
+            entry.name: entry.stat().st_mtime_ns
+            for entry in entries
+            if match(entry.name)
+        }
+
+
+def new_match(root: Path, pattern: str, existing: dict[str, int]) -> Path:
+    """
+    Returns the file matching the pattern that was created or modified since a snapshot.
+
+    Args:
+        root: Directory to scan (not recursive)
+        pattern: Shell-style pattern matched against the file name
+        existing: Snapshot returned by snapshot_matches before the file was built
+
+    Raises:
+        FileNotFoundError: If no matching file is new or newer than in the snapshot
+    """
+    match = _compiled(pattern).match
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if not match(entry.name):
+                continue
+
+            previous_mtime = existing.get(entry.name)
+            if previous_mtime is None or entry.stat().st_mtime_ns > previous_mtime:
+                return Path(entry.path)
+
+    raise FileNotFoundError(f"No new file matching {pattern} found in {root}")
@@ -0,0 +1,10 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+
+def temp_dir(test: TestCase) -> Path:  # pragma: no cover
+    """Creates a temporary directory removed once the test finishes"""
+    tmp = tempfile.TemporaryDirectory()
+    test.addCleanup(tmp.cleanup)
+    return Path(tmp.name)
@@ -0,0 +1,120 @@
+import subprocess
+import sys
+from pathlib import Path
+from unittest import TestCase, mock
+
+from codeenigma.bundler.base import TRASH_PREFIX, build_ext_inprocess, discard_tree
+from codeenigma.bundler.poetry import PoetryBundler
+from tests import temp_dir
+
+
+class TestRemoveReadme(TestCase):  # pragma: no cover
+    def setUp(self):
+        self.pyproject = temp_dir(self) / "pyproject.toml"
+
+    def _strip(self, content: str) -> str:
+        self.pyproject.write_text(content)
+        PoetryBundler.remove_readme_before_build(self.pyproject)
+        return self.pyproject.read_text()
+
+    def test_single_entry(self):
+        self.assertEqual(
+            self._strip('name = "x"\nreadme = "README.md"\nversion = "1"\n'),
+            'name = "x"\n\nversion = "1"\n',
+        )
+
+    def test_multiple_entries(self):
+        self.assertEqual(
+            self._strip('readme = "README.md"\na = 1\nreadme = "README.md"\nb = 2\n'),
+            "\na = 1\n\nb = 2\n",
+        )
+
+    def test_adjacent_entries(self):
+        self.assertEqual(
+            self._strip('a = 1\nreadme = "README.md"readme = "README.md"\nb = 2\n'),
+            "a = 1\n\nb = 2\n",
+        )
+
+    def test_entry_at_eof(self):
+        self.assertEqual(self._strip('a = 1\nreadme = "README.md"'), "a = 1\n")
+
+    def test_only_entry(self):
+        self.assertEqual(self._strip('readme = "README.md"'), "")
+
+    def test_no_entry(self):
+        self.assertEqual(self._strip("a = 1\n"), "a = 1\n")
+
+    def test_empty_file(self):
+        self.assertEqual(self._strip(""), "")
+
+
+SETUP_PY = """
+from setuptools import Extension, setup
+
+setup(
+    name="broken_ext",
+    ext_modules=[Extension("broken_ext", sources=["broken_ext.c"])],
+)
+"""
+
+
+class TestBuildExtInprocess(TestCase):  # pragma: no cover
+    def setUp(self):
+        self.location = temp_dir(self)
+        self.location.joinpath("setup.py").write_text(SETUP_PY)
+
+    def test_failing_build_raises(self):
+        self.location.joinpath("broken_ext.c").write_text("this is not C;\n")
+        cwd = Path.cwd()
+
+        with self.assertRaises(RuntimeError):
+            build_ext_inprocess(self.location)
+
+        self.assertEqual(Path.cwd(), cwd)
+
+
+class TestRunsInProjectEnv(TestCase):  # pragma: no cover
+    def _env_info(self, **kwargs):
+        return mock.patch.object(subprocess, "run", **kwargs)
+
+    def test_matching_env(self):
+        result = subprocess.CompletedProcess([], 0, stdout=f"{sys.prefix}\n")
+        with self._env_info(return_value=result):
+            self.assertTrue(PoetryBundler._runs_in_project_env(Path.cwd()))
+
+    def test_other_env(self):
+        result = subprocess.CompletedProcess([], 0, stdout="/elsewhere/.venv\n")
+        with self._env_info(return_value=result):
+            self.assertFalse(PoetryBundler._runs_in_project_env(Path.cwd()))
+
+    def test_without_poetry_env(self):
+        for error in (FileNotFoundError(), subprocess.CalledProcessError(1, [])):
+            with self._env_info(side_effect=error):
+                self.assertFalse(PoetryBundler._runs_in_project_env(Path.cwd()))
+
+
+class TestDiscardTree(TestCase):  # pragma: no cover
+    def setUp(self):
+        self.root = temp_dir(self)
+
+    def test_removes_directory_without_leaving_trash(self):
+        build = self.root / "build"
+        build.joinpath("temp").mkdir(parents=True)
+        build.joinpath("temp", "module.o").write_bytes(b"")
+
+        discard_tree(build).join()
+
+        self.assertFalse(build.exists())
+        self.assertEqual(list(self.root.iterdir()), [])
+
+    def test_removes_stale_trash(self):
+        stale = self.root / f"{TRASH_PREFIX}interrupted"
+        stale.joinpath("temp").mkdir(parents=True)
+        self.root.joinpath("build").mkdir()
+
+        discard_tree(self.root / "build").join()
+
+        self.assertEqual(list(self.root.iterdir()), [])
+
+    def test_missing_directory_is_ignored(self):
+        discard_tree(self.root / "build")
@@ -0,0 +1,72 @@
+import os
+from pathlib import Path
+from unittest import TestCase
+
+from codeenigma.utils import new_match, newest_match, snapshot_matches, walk_match
+from tests import temp_dir
+
+
+class TestFastGlob(TestCase):  # pragma: no cover
+    def setUp(self):
+        self.root = temp_dir(self)
+
+    def _touch(self, name: str, mtime_ns: int | None = None) -> Path:
+        path = self.root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("")
+        if mtime_ns is not None:
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+        return path
+
+    def test_walk_match(self):
+        self._touch("a.py")
+        self._touch("pkg/b.py")
+        self._touch("pkg/sub/c.py")
+        self._touch("pkg/d.txt")
+        self._touch("pkg/sub/e.py.bak")
+
+        found = sorted(
+            Path(p).relative_to(self.root) for p in walk_match(self.root, "*.py")
+        )
+        self.assertEqual(found, [Path("a.py"), Path("pkg/b.py"), Path("pkg/sub/c.py")])
+
+    def test_newest_match(self):
+        self._touch("old.so", 1_000_000_000)
+        newest = self._touch("new.so", 3_000_000_000)
+        self._touch("mid.so", 2_000_000_000)
+        self._touch("newer.txt", 4_000_000_000)
+        self._touch("sub/deeper.so", 5_000_000_000)
+
+        self.assertEqual(newest_match(self.root, "*.so"), newest)
+
+    def test_newest_match_raises_without_match(self):
+        self._touch("a.txt")
+        with self.assertRaises(FileNotFoundError):
+            newest_match(self.root, "*.so")
+
+    def test_snapshot_matches(self):
+        self._touch("a.so", 1_000_000_000)
+        self._touch("b.txt")
+
+        self.assertEqual(snapshot_matches(self.root, "*.so"), {"a.so": 1_000_000_000})
+
+    def test_new_match_returns_created_file(self):
+        self._touch("stale.so", 1_000_000_000)
+        existing = snapshot_matches(self.root, "*.so")
+        created = self._touch("fresh.so", 1_000_000_000)
+
+        self.assertEqual(new_match(self.root, "*.so", existing), created)
+
+    def test_new_match_returns_rebuilt_file(self):
+        self._touch("module.so", 1_000_000_000)
+        existing = snapshot_matches(self.root, "*.so")
+        rebuilt = self._touch("module.so", 2_000_000_000)
+
+        self.assertEqual(new_match(self.root, "*.so", existing), rebuilt)
+
+    def test_new_match_raises_on_stale_file(self):
+        self._touch("module.so", 1_000_000_000)
+        existing = snapshot_matches(self.root, "*.so")
+
+        with self.assertRaises(FileNotFoundError):
+            new_match(self.root, "*.so", existing)
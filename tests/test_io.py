@@ -0,0 +1,89 @@
+import os
+import re
+import sys
+from pathlib import Path
+from unittest import TestCase, mock, skipUnless
+
+from codeenigma import io
+from tests import temp_dir
+
+PATTERN = re.compile(rb"from codeenigma_runtime")
+OLD_MTIME_NS = 1_000_000_000
+
+
+def _has_io_uring() -> bool:
+    if io.liburing is None or sys.platform != "linux":
+        return False
+
+    ring = io.liburing.Ring()
+    try:
+        io.liburing.io_uring_queue_init(1, ring)
+    except OSError:
+        return False
+    io.liburing.io_uring_queue_exit(ring)
+    return True
+
+
+class RewriteFilesMixin:  # pragma: no cover
+    def setUp(self):
+        self.root = temp_dir(self)
+
+    def _write(self, name: str, content: bytes) -> Path:
+        path = self.root / name
+        path.write_bytes(content)
+        os.utime(path, ns=(OLD_MTIME_NS, OLD_MTIME_NS))
+        return path
+
+    def test_rewrites_files(self):
+        changed = self._write(
+            "changed.py",
+            b"import os\nfrom codeenigma_runtime import a\nfrom codeenigma_runtime import b\n",
+        )
+        unchanged = self._write("unchanged.py", b"import os\n")
+        empty = self._write("empty.py", b"")
+
+        self._rewrite(b"from pkg.codeenigma_runtime")
+
+        self.assertEqual(
+            changed.read_bytes(),
+            b"import os\nfrom pkg.codeenigma_runtime import a\n"
+            b"from pkg.codeenigma_runtime import b\n",
+        )
+        self.assertEqual(unchanged.read_bytes(), b"import os\n")
+        self.assertEqual(unchanged.stat().st_mtime_ns, OLD_MTIME_NS)
+        self.assertEqual(empty.read_bytes(), b"")
+        self.assertEqual(empty.stat().st_mtime_ns, OLD_MTIME_NS)
+
+    def test_shrinking_file_is_truncated(self):
+        shrinking = self._write("shrinking.py", b"from codeenigma_runtime import a\n")
+
+        self._rewrite(b"from r")
+
+        self.assertEqual(shrinking.read_bytes(), b"from r import a\n")
+
+    def test_many_files(self):
+        paths = [
+            self._write(f"f{idx}.py", b"from codeenigma_runtime import a\n")
+            for idx in range(io._RING_ENTRIES + 10)
+        ]
+
+        self._rewrite(b"from pkg.codeenigma_runtime")
+
+        for path in paths:
+            self.assertEqual(
+                path.read_bytes(), b"from pkg.codeenigma_runtime import a\n"
+            )
+
+
+class TestRewriteFilesThreadPool(RewriteFilesMixin, TestCase):  # pragma: no cover
+    def _rewrite(self, replacement: bytes) -> None:
+        with mock.patch.object(io, "liburing", None):
+            io.rewrite_files(sorted(self.root.iterdir()), PATTERN, replacement)
+
+
+@skipUnless(_has_io_uring(), "liburing or io_uring isn't available")
+class TestRewriteFilesUring(RewriteFilesMixin, TestCase):  # pragma: no cover
+    def _rewrite(self, replacement: bytes) -> None:
+        with mock.patch.object(io, "_uring_rewrite", wraps=io._uring_rewrite) as ring:
+            io.rewrite_files(sorted(self.root.iterdir()), PATTERN, replacement)
+        ring.assert_called_once()
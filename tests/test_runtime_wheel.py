@@ -0,0 +1,67 @@
+import base64
+import hashlib
+import zipfile
+from unittest import TestCase
+
+from codeenigma import __version__
+from codeenigma.runtime.cython.builder import _build_runtime_wheel_inprocess
+from tests import temp_dir
+
+
+class TestRuntimeWheel(TestCase):  # pragma: no cover
+    def setUp(self):
+        self.root = temp_dir(self)
+        self.runtime_dir = self.root / "codeenigma_runtime"
+        self.runtime_dir.mkdir()
+        self.runtime_dir.joinpath("__init__.py").write_text("from .x import *\n")
+        self.runtime_dir.joinpath("codeenigma_runtime.pyi").write_text("")
+        self.runtime_dir.joinpath("codeenigma_runtime.so").write_bytes(b"\x7fELF")
+        self.runtime_dir.joinpath("__pycache__").mkdir()
+
+        self.wheel_path = _build_runtime_wheel_inprocess(
+            self.runtime_dir, self.root / "dist"
+        )
+        self.dist_info = f"codeenigma_runtime-{__version__}.dist-info"
+
+    def test_wheel_name(self):
+        self.assertEqual(
+            self.wheel_path.name, f"codeenigma_runtime-{__version__}-py3-none-any.whl"
+        )
+
+    def test_members(self):
+        with zipfile.ZipFile(self.wheel_path) as whl:
+            self.assertEqual(
+                whl.namelist(),
+                [
+                    "codeenigma_runtime/__init__.py",
+                    "codeenigma_runtime/codeenigma_runtime.pyi",
+                    "codeenigma_runtime/codeenigma_runtime.so",
+                    f"{self.dist_info}/METADATA",
+                    f"{self.dist_info}/WHEEL",
+                    f"{self.dist_info}/RECORD",
+                ],
+            )
+
+    def test_metadata(self):
+        with zipfile.ZipFile(self.wheel_path) as whl:
+            metadata = whl.read(f"{self.dist_info}/METADATA").decode().splitlines()
+
+        self.assertIn("Name: codeenigma_runtime", metadata)
+        self.assertIn(f"Version: {__version__}", metadata)
+        self.assertIn("Requires-Python: >=3.10,<3.14", metadata)
+        self.assertIn("Requires-Dist: rich (>=13.0.0)", metadata)
+        self.assertIn("Requires-Dist: cython (>=3.0.0)", metadata)
+
+    def test_record_hashes(self):
+        with zipfile.ZipFile(self.wheel_path) as whl:
+            record = whl.read(f"{self.dist_info}/RECORD").decode().splitlines()
+            entries = dict(line.split(",", 1) for line in record)
+
+            self.assertEqual(set(entries), set(whl.namelist()))
+            self.assertEqual(entries.pop(f"{self.dist_info}/RECORD"), ",")
+            for arcname, entry in entries.items():
+                data = whl.read(arcname)
+                digest = base64.urlsafe_b64encode(hashlib.sha256(data).digest())
+                self.assertEqual(
+                    entry, f"sha256={digest.rstrip(b'=').decode()},{len(data)}"
+                )